@@ -3,9 +3,13 @@ import streamlit as st
 import pandas as pd
 from datetime import date
 from io import BytesIO
-from supabase_conn import supabase
+from supabase_conn import supabase, select_all
 from excel_template import create_template_excel, REQUIRED_COLUMNS
 from excel_export import generate_excel_bytes
+from file_import import read_upload, build_records, SUPPORTED_TYPES
+from search_index import NGRAM, SearchIndex, sync_search_index
+from archive import ARCHIVE_AFTER_DAYS, ARCHIVE_TABLE, archive_settled, oldest_archived_date, archived_no_po
+from pagination import PAGE_SIZES, SORT_COLUMNS, order_columns, cursor_from_row, keyset_condition, month_condition, combine_conditions
 from utils import df_format_for_display, fmt_currency
 from zoneinfo import ZoneInfo
 
@@ -25,6 +29,18 @@ if "show_pay_dialog" not in st.session_state:
     st.session_state.show_pay_dialog = False
 if "pay_rec_id" not in st.session_state:
     st.session_state.pay_rec_id = None
+if "tbl_cursors" not in st.session_state:
+    st.session_state.tbl_cursors = [None]  # start cursor of each visited page
+if "tbl_sig" not in st.session_state:
+    st.session_state.tbl_sig = None
+if "tbl_total" not in st.session_state:
+    st.session_state.tbl_total = 0  # filtered row count, taken on the first page
+if "arch_cursors" not in st.session_state:
+    st.session_state.arch_cursors = [None]  # same as tbl_* for the archive table
+if "arch_sig" not in st.session_state:
+    st.session_state.arch_sig = None
+if "arch_total" not in st.session_state:
+    st.session_state.arch_total = 0
 
 # -------- top navigation (buttons) --------
 col1, col2, col3, col4, col5 = st.columns([3,1,1,1,1])
@@ -49,112 +65,169 @@ with col4:
 st.markdown("---")
 
 # -------- helper functions --------
+@st.cache_data(ttl=60, show_spinner=False)
 def fetch_all():
-    res = supabase.table("po_sales").select("*").order("created_at", desc=True).execute()
-    data = res.data or []
-    return pd.DataFrame(data)
+    # cached so reruns (paging, search typing) don't reload the table;
+    # cleared on our own writes, other sessions' writes show up within the ttl
+    # returns (df, version); version is derived from the searchable columns,
+    # so every session sees the same value for the same data
+    data = select_all(lambda: supabase.table("po_sales").select("*").order("created_at", desc=True).order("id", desc=True))
+    df = pd.DataFrame(data)
+    cols = [c for c in ["id", "no_po", "customer"] if c in df.columns]
+    version = int(pd.util.hash_pandas_object(df[cols], index=False).sum()) if cols else 0
+    return df, version
+
+def fetch_page(sort_col, desc, cursor, page_size, status=None, month=None, start_date=None, end_date=None, table="po_sales"):
+    # keyset pagination: fetch one page (+1 row to know if there is a next page).
+    # Only the first page (cursor None) asks for an exact count of the filtered rows;
+    # later pages return total=None and the caller keeps the first-page total.
+    q = supabase.table(table).select("*", count="exact" if cursor is None else None)
+    if status:
+        q = q.eq("status", status)
+    if start_date:
+        q = q.gte("tanggal", str(start_date))
+    if end_date:
+        q = q.lte("tanggal", str(end_date))
+    cond = combine_conditions(
+        month_condition(month, start_date, end_date),
+        keyset_condition(sort_col, desc, cursor),
+    )
+    if cond:
+        q = q.or_(cond)
+    for c in order_columns(sort_col):
+        q = q.order(c, desc=desc)
+    res = q.limit(page_size + 1).execute()
+    rows = res.data or []
+    return rows[:page_size], len(rows) > page_size, (res.count or 0) if cursor is None else None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_archive_page(cursor, page_size, status=None, month=None, start_date=None, end_date=None):
+    # archived history, newest first, one page per query; tanggal / month filters
+    # run server-side so only the relevant months are read. Cached: it only
+    # changes when run_archive() moves rows.
+    return fetch_page("tanggal", True, cursor, page_size, status=status, month=month,
+                      start_date=start_date, end_date=end_date, table=ARCHIVE_TABLE)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_oldest_archived():
+    return oldest_archived_date(supabase)
 
 def check_duplicate_no_po(no_po):
     res = supabase.table("po_sales").select("id").eq("no_po", no_po).limit(1).execute()
     return len(res.data) > 0
 
+def fetch_existing_no_po(no_pos, batch_size=500):
+    # one query per batch instead of one per row
+    existing = set()
+    for i in range(0, len(no_pos), batch_size):
+        res = supabase.table("po_sales").select("no_po").in_("no_po", no_pos[i:i + batch_size]).execute()
+        existing.update(r["no_po"] for r in (res.data or []))
+    # archived (Lunas) POs still count as existing
+    return existing | archived_no_po(supabase, no_pos)
+
+def no_po_in_archive(no_po):
+    return bool(archived_no_po(supabase, [no_po]))
+
+def run_archive(older_than_days):
+    # move Lunas POs older than cutoff (by tanggal) to the archive table
+    cutoff = (pd.Timestamp.now(tz=JAKARTA) - pd.Timedelta(days=older_than_days)).date()
+    try:
+        return archive_settled(supabase, cutoff)
+    finally:
+        # earlier batches may have moved even if a later one failed
+        invalidate_data()
+        fetch_archive_page.clear()
+        fetch_oldest_archived.clear()
+
+def invalidate_data():
+    # reload table data after our own writes; the search index follows the
+    # new data version incrementally
+    fetch_all.clear()
+
+@st.cache_resource
+def get_search_index():
+    # one index per process, shared by all sessions, synced to the data version
+    return SearchIndex()
+
 def insert_record(rec):
-    return supabase.table("po_sales").insert(rec).execute()
+    res = supabase.table("po_sales").insert(rec).execute()
+    invalidate_data()
+    return res
+
+def insert_batches(recs, batch_size=1000):
+    # bulk import in chunks so large files don't hit request size limits.
+    # Returns (inserted, error): earlier batches stay committed if a later one fails.
+    inserted = 0
+    try:
+        for i in range(0, len(recs), batch_size):
+            res = supabase.table("po_sales").insert(recs[i:i + batch_size]).execute()
+            if res.data is None:
+                return inserted, "respon kosong dari database"
+            inserted += len(res.data)
+    except Exception as e:
+        return inserted, e
+    finally:
+        invalidate_data()
+    return inserted, None
 
 def update_record(rec_id, rec):
-    return supabase.table("po_sales").update(rec).eq("id", rec_id).execute()
+    res = supabase.table("po_sales").update(rec).eq("id", rec_id).execute()
+    invalidate_data()
+    return res
 
 def delete_record(rec_id):
-    return supabase.table("po_sales").delete().eq("id", rec_id).execute()
+    res = supabase.table("po_sales").delete().eq("id", rec_id).execute()
+    invalidate_data()
+    return res
 
 # -------- IMPORT UPLOADER (tunnel/expander) --------
 if st.session_state.show_import:
-    with st.expander("Import Excel — klik untuk buka / tutup", expanded=True):
-        st.markdown("Gunakan template Excel yang tersedia. Jika kolom tidak sesuai, import akan gagal.")
+    with st.expander("Import File — klik untuk buka / tutup", expanded=True):
+        st.markdown("Gunakan template Excel yang tersedia (atau CSV / Parquet dengan kolom yang sama). Jika kolom tidak sesuai, import akan gagal.")
         # download template
         template_bytes = create_template_excel()
         st.download_button("📥 Download Template Excel", template_bytes, file_name="template_po.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-        uploaded = st.file_uploader("Upload file Excel (.xlsx)", type=["xlsx"])
+        uploaded = st.file_uploader("Upload file (.xlsx, .csv, .parquet)", type=SUPPORTED_TYPES)
         if uploaded:
             try:
-                df_upload = pd.read_excel(uploaded)
+                df_norm, missing = read_upload(uploaded)
             except Exception as e:
                 st.error(f"Gagal membaca file: {e}")
-                df_upload = None
-
-            if df_upload is not None:
-                # validate columns (case-insensitive)
-                cols_lower = [c.lower().strip() for c in df_upload.columns]
-                mapping = {}
-                for c in df_upload.columns:
-                    mapping[c] = c.lower().strip()
-                missing = [c for c in REQUIRED_COLUMNS if c not in cols_lower]
-                if missing:
-                    st.error(f"Format kolom tidak sesuai. Kolom yg wajib: {REQUIRED_COLUMNS}. Kolom yang hilang: {missing}")
-                else:
-                    # normalize column names to required names
-                    # map existing columns to required lowercase names
-                    df_norm = df_upload.copy()
-                    rename_map = {}
-                    for c in df_upload.columns:
-                        key = c.lower().strip()
-                        if key in REQUIRED_COLUMNS:
-                            rename_map[c] = key
-                    df_norm = df_norm.rename(columns=rename_map)
-                    # fill missing optional columns
-                    for c in REQUIRED_COLUMNS:
-                        if c not in df_norm.columns:
-                            df_norm[c] = None
-
-                    # compute sisa & status
-                    df_norm["total_tagihan"] = pd.to_numeric(df_norm["total_tagihan"], errors="coerce").fillna(0)
-                    df_norm["total_bayar"] = pd.to_numeric(df_norm["total_bayar"], errors="coerce").fillna(0)
-                    df_norm["sisa"] = df_norm["total_tagihan"] - df_norm["total_bayar"]
-                    df_norm["status"] = df_norm["sisa"].apply(lambda x: "Lunas" if x <= 0 else "Belum Lunas")
-                    # created_at will be set by supabase (server) if configured; otherwise set now in UTC
-                    df_norm["created_at"] = pd.Timestamp.utcnow().isoformat()
-
-                    # check duplicates
-                    duplicates = []
-                    to_insert = []
-                    for _, row in df_norm.iterrows():
-                        no_po = str(row["no_po"]).strip()
-                        if not no_po:
-                            duplicates.append((no_po, "no_po kosong"))
-                            continue
-                        # check supabase existing
-                        exists = supabase.table("po_sales").select("id").eq("no_po", no_po).limit(1).execute()
-                        if exists.data and len(exists.data) > 0:
-                            duplicates.append((no_po, "sudah ada"))
-                        else:
-                            rec = {
-                                "no_po": no_po,
-                                "customer": row.get("customer"),
-                                "total_tagihan": float(row.get("total_tagihan", 0)),
-                                "total_bayar": float(row.get("total_bayar", 0)),
-                                "sisa": float(row.get("sisa", 0)),
-                                "status": row.get("status"),
-                                "tanggal": str(row.get("tanggal")) if not pd.isna(row.get("tanggal")) else None,
-                                "jatuh_tempo": str(row.get("jatuh_tempo")) if not pd.isna(row.get("jatuh_tempo")) else None,
-                                "created_at": row.get("created_at")
-                            }
-                            to_insert.append(rec)
-
-                    if duplicates:
-                        st.error("Beberapa baris tidak diimport karena duplikat atau error pada no_po:")
-                        for d in duplicates[:50]:
-                            st.write(f"- {d[0]}: {d[1]}")
-                        if len(duplicates) > 50:
-                            st.write(f"...dan {len(duplicates)-50} lagi")
-                    if to_insert:
-                        # batch insert
-                        res = supabase.table("po_sales").insert(to_insert).execute()
-                        if res.data is None:
-                            st.error("Gagal import data.")
-                        else:
-                            st.success(f"Berhasil memasukkan {len(to_insert)} record.")
-                            st.session_state.page = "dashboard"
-                            st.rerun()
+                df_norm, missing = None, []
+
+            if missing:
+                st.error(f"Format kolom tidak sesuai. Kolom yg wajib: {REQUIRED_COLUMNS}. Kolom yang hilang: {missing}")
+            elif df_norm is not None:
+                # check duplicates: empty no_po, repeated inside the file, or already in supabase
+                duplicates = [(no_po, "no_po kosong") for no_po in df_norm.loc[df_norm["no_po"] == "", "no_po"]]
+                df_norm = df_norm[df_norm["no_po"] != ""]
+                in_file = df_norm["no_po"].duplicated(keep="first")
+                duplicates += [(no_po, "duplikat di file") for no_po in df_norm.loc[in_file, "no_po"]]
+                df_norm = df_norm[~in_file]
+                existing = fetch_existing_no_po(df_norm["no_po"].tolist())
+                in_db = df_norm["no_po"].isin(existing)
+                duplicates += [(no_po, "sudah ada") for no_po in df_norm.loc[in_db, "no_po"]]
+                df_norm = df_norm[~in_db]
+
+                # created_at will be set by supabase (server) if configured; otherwise set now in UTC
+                to_insert = build_records(df_norm, pd.Timestamp.utcnow().isoformat())
+
+                if duplicates:
+                    st.error("Beberapa baris tidak diimport karena duplikat atau error pada no_po:")
+                    for d in duplicates[:50]:
+                        st.write(f"- {d[0]}: {d[1]}")
+                    if len(duplicates) > 50:
+                        st.write(f"...dan {len(duplicates)-50} lagi")
+                if to_insert:
+                    # batch insert
+                    inserted, err = insert_batches(to_insert)
+                    if err is None:
+                        st.success(f"Berhasil memasukkan {inserted} record.")
+                        st.session_state.page = "dashboard"
+                        st.rerun()
+                    else:
+                        st.error(f"Gagal import data: {err}. {inserted} dari {len(to_insert)} record sudah tersimpan; "
+                                 "jika import diulang, record tersebut akan dilaporkan 'sudah ada'.")
 
             # end uploaded handling
 
@@ -180,6 +253,8 @@ if st.session_state.page == "input" and st.session_state.edit_id is None:
             exists = supabase.table("po_sales").select("id").eq("no_po", no_po_str).limit(1).execute()
             if exists.data and len(exists.data) > 0:
                 st.error("no_po sudah ada silahkan tekan tombol edit untuk mengubah")
+            elif no_po_in_archive(no_po_str):
+                st.error("no_po sudah ada di arsip (PO Lunas lama).")
             else:
                 sisa = float(total_tagihan) - float(total_bayar)
                 status = "Lunas" if sisa <= 0 else "Belum Lunas"
@@ -194,7 +269,7 @@ if st.session_state.page == "input" and st.session_state.edit_id is None:
                     "jatuh_tempo": str(jatuh_tempo),
                     "created_at": pd.Timestamp.now(tz=JAKARTA).isoformat()
                 }
-                res = supabase.table("po_sales").insert(rec).execute()
+                res = insert_record(rec)
                 if res.data is None:
                     st.error("Gagal menyimpan data PO.")
                 else:
@@ -206,22 +281,48 @@ if st.session_state.page == "input" and st.session_state.edit_id is None:
 if st.session_state.page == "dashboard":
     st.header("Dashboard PO")
 
-    # fetch data
-    df = fetch_all()
+    # archive: settled POs older than N days move to the archive table
+    with st.expander("📦 Arsip PO Lunas"):
+        archive_days = st.number_input("Arsipkan PO Lunas dengan tanggal lebih lama dari (hari)", min_value=30, value=max(30, ARCHIVE_AFTER_DAYS), step=30)
+        confirm_archive = st.checkbox("Konfirmasi: pindahkan PO Lunas lama ke arsip (tidak bisa diedit lagi)", key="chk_archive")
+        if st.button("Arsipkan Sekarang"):
+            if not confirm_archive:
+                st.warning("Centang konfirmasi arsip.")
+            else:
+                try:
+                    moved, skipped = run_archive(int(archive_days))
+                    st.success(f"{moved} record dipindahkan ke arsip.")
+                    if skipped:
+                        st.warning(f"{skipped} record dilewati karena berubah saat proses arsip (atau tidak boleh dihapus); record tersebut tetap di po_sales.")
+                except Exception as e:
+                    st.error(f"Gagal mengarsipkan: {e}")
+        st.caption(f"PO yang diarsipkan disimpan di tabel `{ARCHIVE_TABLE}` (hanya baca).")
+
+    # fetch data (hot tier: open + recent POs)
+    df, data_version = fetch_all()
+
+    # filters: status, bulan, tanggal range (also apply to the archive, so they
+    # stay reachable when every PO has been archived)
+    c1, c2, c3, c4 = st.columns([1,1,2,2])
+    include_archive = st.checkbox("Sertakan arsip (riwayat PO Lunas)", value=False)
+    has_dates = not df.empty and "tanggal" in df.columns
+    min_date = pd.to_datetime(df["tanggal"]).min().date() if has_dates else date.today()
+    max_date = pd.to_datetime(df["tanggal"]).max().date() if has_dates else date.today()
+    if include_archive and not has_dates:
+        # only history left: start from the oldest archived month
+        min_date = fetch_oldest_archived() or min_date
+    with c1:
+        status_filter = st.selectbox("Filter Status", options=["Semua", "Lunas", "Belum Lunas"], index=0)
+    with c2:
+        month_filter = st.selectbox("Filter Bulan", options=["Semua"] + [f"{m:02d}" for m in range(1,13)], index=0)
+    with c3:
+        start_date = st.date_input("Dari Tanggal", value=min_date)
+    with c4:
+        end_date = st.date_input("Sampai Tanggal", value=max_date)
+
     if df.empty:
-        st.info("Belum ada data PO.")
+        st.info("Belum ada data PO aktif." + (" Lihat arsip di bawah." if include_archive else ""))
     else:
-        # filters: status, bulan, tanggal range
-        c1, c2, c3, c4 = st.columns([1,1,2,2])
-        with c1:
-            status_filter = st.selectbox("Filter Status", options=["Semua", "Lunas", "Belum Lunas"], index=0)
-        with c2:
-            month_filter = st.selectbox("Filter Bulan", options=["Semua"] + [f"{m:02d}" for m in range(1,13)], index=0)
-        with c3:
-            start_date = st.date_input("Dari Tanggal", value=pd.to_datetime(df["tanggal"]).min().date() if "tanggal" in df.columns else date.today())
-        with c4:
-            end_date = st.date_input("Sampai Tanggal", value=pd.to_datetime(df["tanggal"]).max().date() if "tanggal" in df.columns else date.today())
-
         df["tanggal"] = pd.to_datetime(df["tanggal"], errors="coerce")
         # filtering
         mask = pd.Series([True]*len(df))
@@ -282,15 +383,33 @@ if st.session_state.page == "dashboard":
         except Exception as e:
             st.write(f"Chart tidak tersedia: {e}")
 
-        # show table with highlight
-        from pandas.io.formats.style import Styler
-        display_df = df_format_for_display(df_filtered)
-        # add action column (edit/delete)
-        display_df = display_df.reset_index(drop=True)
+        # show table with highlight (one page at a time, keyset pagination)
+        st.markdown("#### Tabel PO (lihat kolom `id` untuk pilih record → gunakan tombol Edit / Hapus)")
+        t1, t2, t3 = st.columns([2,1,1])
+        with t1:
+            sort_label = st.selectbox("Urutkan", options=list(SORT_COLUMNS), index=0)
+        with t2:
+            sort_desc = st.selectbox("Arah", options=["Terbaru / Terbesar", "Terlama / Terkecil"], index=0) == "Terbaru / Terbesar"
+        with t3:
+            page_size = st.selectbox("Baris per halaman", options=PAGE_SIZES, index=1)
+        sort_col = SORT_COLUMNS[sort_label]
+
+        # reset to first page whenever filters / sort change
+        tbl_sig = (status_filter, month_filter, start_date, end_date, sort_col, sort_desc, page_size)
+        if st.session_state.tbl_sig != tbl_sig:
+            st.session_state.tbl_sig = tbl_sig
+            st.session_state.tbl_cursors = [None]
+
+        page_rows, has_next, total = fetch_page(
+            sort_col, sort_desc, st.session_state.tbl_cursors[-1], page_size,
+            status=None if status_filter == "Semua" else status_filter,
+            month=None if month_filter == "Semua" else int(month_filter),
+            start_date=start_date, end_date=end_date,
+        )
+        page_no = len(st.session_state.tbl_cursors)
+        if total is not None:
+            st.session_state.tbl_total = total
 
-        # show as interactive table with action buttons per row (use st.table + select by index)
-        st.markdown("#### Tabel PO (klik baris index untuk pilih record → gunakan tombol Edit / Hapus)")
-        # show small table
         def highlight_status(row):
             if row["status"] == "Lunas":
                 return ['background-color: #b2f2bb'] * len(row)
@@ -299,13 +418,53 @@ if st.session_state.page == "dashboard":
             elif row["jatuh_tempo"] and pd.to_datetime(row["jatuh_tempo"]) < pd.Timestamp.now().tz_localize(None):
                 return ['background-color: #ffc9c9'] * len(row)
             return [''] * len(row)
-        
-        st.dataframe(display_df.style.apply(highlight_status, axis=1), use_container_width=True)
+
+        if page_rows:
+            # only the current page is formatted and sent to the browser
+            display_df = df_format_for_display(pd.DataFrame(page_rows)).reset_index(drop=True)
+            st.dataframe(display_df.style.apply(highlight_status, axis=1), use_container_width=True)
+        else:
+            st.info("Tidak ada data untuk filter ini.")
+
+        p1, p2, p3 = st.columns([1,2,1])
+        with p1:
+            if st.button("⬅️ Sebelumnya", disabled=page_no <= 1):
+                st.session_state.tbl_cursors.pop()
+                st.rerun()
+        with p2:
+            total_rows = st.session_state.tbl_total
+            total_pages = max(1, -(-total_rows // page_size))
+            st.caption(f"Halaman {page_no} dari {total_pages} ({total_rows} record)")
+        with p3:
+            if st.button("Berikutnya ➡️", disabled=not has_next):
+                st.session_state.tbl_cursors.append(cursor_from_row(page_rows[-1], sort_col))
+                st.rerun()
+
+        # search: no_po / customer (prefix, substring & fuzzy) via prebuilt index
+        search_q = st.text_input("🔍 Cari no_po / customer")
+        picked_id = None
+        if search_q:
+            # synced lazily, only when someone searches; covers editable (hot) rows
+            # only, since archived POs can't be edited / paid / deleted
+            search_index = sync_search_index(get_search_index(), df, data_version)
+            hits = search_index.search(search_q, limit=50)
+            short_query = len(search_q.strip()) < NGRAM
+            if short_query:
+                st.caption(f"Kurang dari {NGRAM} karakter: hanya mencocokkan awal no_po / customer. Ketik minimal {NGRAM} karakter untuk mencari di tengah teks.")
+            if hits:
+                st.dataframe(pd.DataFrame(hits), use_container_width=True, hide_index=True)
+                labels = {h["id"]: f'{h["id"]} — {h["no_po"]} — {h["customer"]}' for h in hits}
+                picked_id = st.selectbox("Pilih record dari hasil pencarian", options=[None] + list(labels),
+                                         format_func=lambda i: "-" if i is None else labels[i])
+            elif not short_query:
+                st.caption("Tidak ada hasil.")
 
         # selection
         sel = st.text_input("Masukkan id (kolom `id`) dari record untuk Edit / Hapus, atau kosongkan")
         # Provide guidance: show id column
-        st.caption("Untuk melihat kolom `id`, periksa tabel di atas (kolom id). Gunakan id tersebut untuk edit/hapus.")
+        st.caption("Untuk melihat kolom `id`, periksa tabel di atas (kolom id) atau pilih dari hasil pencarian. Gunakan id tersebut untuk edit/hapus.")
+        if not sel and picked_id is not None:
+            sel = str(picked_id)
 
         col_edit, col_pay, col_del, col_refresh, col_download = st.columns([1, 1, 1, 1, 1])
         # with col_edit:
@@ -443,6 +602,7 @@ if st.session_state.page == "dashboard":
         # --- TOMBOL 4: REFRESH ---
         with col_refresh:
             if st.button("🔄 Refresh"):
+                invalidate_data()
                 st.session_state.show_pay_dialog = False
                 st.rerun()
 
@@ -541,6 +701,42 @@ if st.session_state.page == "dashboard":
             else:
                 st.error("Data tidak ditemukan saat mengambil detail.")
 
+    # archived rows (read-only), same filters, keyset-paged on the server
+    if include_archive:
+        st.markdown("---")
+        st.markdown("#### Arsip PO Lunas (hanya baca)")
+        st.caption("Mengikuti filter di atas; ubah 'Dari Tanggal' untuk melihat riwayat yang lebih lama.")
+        arch_page_size = st.selectbox("Baris per halaman (arsip)", options=PAGE_SIZES, index=1)
+        arch_sig = (status_filter, month_filter, start_date, end_date, arch_page_size)
+        if st.session_state.arch_sig != arch_sig:
+            st.session_state.arch_sig = arch_sig
+            st.session_state.arch_cursors = [None]
+        arch_rows, arch_has_next, arch_total = fetch_archive_page(
+            st.session_state.arch_cursors[-1], arch_page_size,
+            status=None if status_filter == "Semua" else status_filter,
+            month=None if month_filter == "Semua" else int(month_filter),
+            start_date=start_date, end_date=end_date,
+        )
+        if arch_total is not None:
+            st.session_state.arch_total = arch_total
+        if arch_rows:
+            st.dataframe(df_format_for_display(pd.DataFrame(arch_rows)).reset_index(drop=True), use_container_width=True)
+        else:
+            st.info("Tidak ada data arsip untuk filter ini.")
+        arch_page_no = len(st.session_state.arch_cursors)
+        a1, a2, a3 = st.columns([1,2,1])
+        with a1:
+            if st.button("⬅️ Sebelumnya", key="arch_prev", disabled=arch_page_no <= 1):
+                st.session_state.arch_cursors.pop()
+                st.rerun()
+        with a2:
+            arch_pages = max(1, -(-st.session_state.arch_total // arch_page_size))
+            st.caption(f"Halaman {arch_page_no} dari {arch_pages} ({st.session_state.arch_total} record)")
+        with a3:
+            if st.button("Berikutnya ➡️", key="arch_next", disabled=not arch_has_next):
+                st.session_state.arch_cursors.append(cursor_from_row(arch_rows[-1], "tanggal"))
+                st.rerun()
+
 # Edit flow: if edit_id set and page input
 if st.session_state.page == "input" and st.session_state.edit_id:
     # load existing record
@@ -572,6 +768,9 @@ if st.session_state.page == "input" and st.session_state.edit_id:
                 if check.data and len(check.data) > 0:
                     st.error("no_po sudah ada silahkan gunakan nomor lain atau edit record yang ada.")
                     proceed_update = False
+                elif no_po_in_archive(no_po):
+                    st.error("no_po sudah ada di arsip (PO Lunas lama).")
+                    proceed_update = False
             
             # 2. Jika validasi aman, lakukan update
             if proceed_update:
@@ -0,0 +1,70 @@
+# archive.py
+# Cold tier for settled (Lunas) POs: a separate Supabase table with the same
+# columns as po_sales. It lives next to the hot table, so every instance sees
+# the same archive and nothing depends on the app host's disk.
+#
+# Expected schema (run once in the Supabase SQL editor):
+#
+#   create table po_sales_archive (like po_sales including defaults);
+#   alter table po_sales_archive add primary key (id);
+#   create unique index po_sales_archive_no_po on po_sales_archive (no_po);
+#   create index po_sales_archive_tanggal on po_sales_archive (tanggal);
+#
+# For very large archives the table can be declared
+# "partition by range (tanggal)" with one partition per month; the dashboard
+# reads it a page at a time with tanggal / month filters, so only the
+# relevant months are touched.
+import os
+import pandas as pd
+
+ARCHIVE_TABLE = os.getenv("ARCHIVE_TABLE", "po_sales_archive")
+# settled POs older than this (by tanggal) move to the archive
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+
+def archive_settled(client, cutoff, batch_size=1000):
+    """Move Lunas POs with tanggal < cutoff from po_sales to the archive table.
+
+    Each batch is upserted on id (so a retry overwrites instead of
+    duplicating) and then deleted from po_sales with the same Lunas / cutoff
+    predicate. Rows the delete didn't remove were changed concurrently (or
+    the delete was blocked, e.g. by RLS); their copies are removed from the
+    archive again so po_sales stays the source of truth.
+    Returns (moved, skipped).
+    """
+    moved = 0
+    skipped = 0
+    last_id = None
+    while True:
+        q = client.table("po_sales").select("*").eq("status", "Lunas").lt("tanggal", str(cutoff))
+        if last_id is not None:
+            q = q.gt("id", last_id)
+        rows = q.order("id").limit(batch_size).execute().data or []
+        if not rows:
+            return moved, skipped
+        ids = [r["id"] for r in rows]
+        client.table(ARCHIVE_TABLE).upsert(rows, on_conflict="id").execute()
+        deleted = (
+            client.table("po_sales").delete()
+            .in_("id", ids).eq("status", "Lunas").lt("tanggal", str(cutoff))
+            .execute().data or []
+        )
+        deleted_ids = {r["id"] for r in deleted}
+        stale = [i for i in ids if i not in deleted_ids]
+        if stale:
+            client.table(ARCHIVE_TABLE).delete().in_("id", stale).execute()
+        moved += len(deleted_ids)
+        skipped += len(stale)
+        last_id = ids[-1]
+
+def oldest_archived_date(client):
+    res = client.table(ARCHIVE_TABLE).select("tanggal").order("tanggal").limit(1).execute()
+    return pd.to_datetime(res.data[0]["tanggal"]).date() if res.data else None
+
+def archived_no_po(client, no_pos, batch_size=500):
+    # which of no_pos already exist in the archive (unique index lookup)
+    found = set()
+    no_pos = list(no_pos)
+    for i in range(0, len(no_pos), batch_size):
+        res = client.table(ARCHIVE_TABLE).select("no_po").in_("no_po", no_pos[i:i + batch_size]).execute()
+        found.update(r["no_po"] for r in (res.data or []))
+    return found
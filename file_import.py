@@ -0,0 +1,153 @@
+# file_import.py
+import csv
+import pandas as pd
+from excel_template import REQUIRED_COLUMNS
+
+# Rows per chunk when streaming CSV uploads
+CSV_CHUNK_SIZE = 50_000
+
+# Columns that must stay text (otherwise "001" -> 1 or "1001" -> 1001.0)
+TEXT_COLUMNS = ["no_po", "customer"]
+
+SUPPORTED_TYPES = ["xlsx", "csv", "parquet"]
+
+def detect_format(filename, head=b""):
+    # Detect from extension first, fall back to magic bytes
+    name = (filename or "").lower().strip()
+    for ext in SUPPORTED_TYPES:
+        if name.endswith(f".{ext}"):
+            return ext
+    if head[:4] == b"PAR1":
+        return "parquet"
+    if head[:2] == b"PK":
+        return "xlsx"
+    if head:
+        return "csv"
+    return None
+
+def _column_map(columns):
+    # map original column names -> required lowercase names (case-insensitive)
+    rename_map = {}
+    for c in columns:
+        key = str(c).lower().strip()
+        if key in REQUIRED_COLUMNS and key not in rename_map.values():
+            rename_map[c] = key
+    missing = [c for c in REQUIRED_COLUMNS if c not in rename_map.values()]
+    return rename_map, missing
+
+def _py_values(s, fmt=None):
+    # list of Python values with None for every kind of null (None / NaN / NaT / NA)
+    return [None if pd.isna(v) else (fmt(v) if fmt else v) for v in s.tolist()]
+
+def _as_text(s):
+    # one text rule for every format: 1001 / 1001.0 / "1001" -> "1001", nulls stay None
+    if pd.api.types.is_float_dtype(s):
+        present = s.dropna()
+        if (present == present.round()).all():
+            s = s.astype("Int64")
+    return pd.Series(_py_values(s, lambda v: str(v).strip()), index=s.index, dtype=object)
+
+def normalize_upload(df):
+    # Rename to required columns, compute sisa & status (vectorized)
+    rename_map, _ = _column_map(df.columns)
+    df_norm = df[list(rename_map)].rename(columns=rename_map)
+    for c in REQUIRED_COLUMNS:
+        if c not in df_norm.columns:
+            df_norm[c] = None
+
+    for c in TEXT_COLUMNS:
+        df_norm[c] = _as_text(df_norm[c])
+    df_norm["no_po"] = df_norm["no_po"].fillna("")
+    df_norm["total_tagihan"] = pd.to_numeric(df_norm["total_tagihan"], errors="coerce").fillna(0).astype(float)
+    df_norm["total_bayar"] = pd.to_numeric(df_norm["total_bayar"], errors="coerce").fillna(0).astype(float)
+    df_norm["sisa"] = df_norm["total_tagihan"] - df_norm["total_bayar"]
+    df_norm["status"] = "Belum Lunas"
+    df_norm.loc[df_norm["sisa"] <= 0, "status"] = "Lunas"
+    return df_norm
+
+def _text_dtypes(rename_map):
+    # read text columns as str so the parser never turns them into numbers
+    return {c: str for c, key in rename_map.items() if key in TEXT_COLUMNS}
+
+def _sniff_delimiter(uploaded):
+    # ERP / Excel exports in id-ID locale often use ";" instead of ","
+    first_line = uploaded.readline().decode("utf-8-sig", errors="replace")
+    uploaded.seek(0)
+    try:
+        return csv.Sniffer().sniff(first_line, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ","
+
+def _read_csv(uploaded):
+    sep = _sniff_delimiter(uploaded)
+    header = pd.read_csv(uploaded, nrows=0, sep=sep)
+    rename_map, missing = _column_map(header.columns)
+    if missing:
+        return None, missing
+    uploaded.seek(0)
+    dtype = _text_dtypes(rename_map)
+    # stream in chunks, only parsing the columns we need
+    chunks = pd.read_csv(uploaded, sep=sep, usecols=list(rename_map), dtype=dtype, chunksize=CSV_CHUNK_SIZE)
+    parts = [normalize_upload(chunk) for chunk in chunks]
+    if not parts:
+        return normalize_upload(header[list(rename_map)]), []
+    return pd.concat(parts, ignore_index=True), []
+
+def _read_parquet(uploaded):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(uploaded)
+    rename_map, missing = _column_map(pf.schema_arrow.names)
+    if missing:
+        return None, missing
+    # columnar read: only the required columns are decoded
+    table = pf.read(columns=list(rename_map))
+    for c in _text_dtypes(rename_map):
+        col = table.column(c)
+        # floats are left to _as_text so 1001.0 doesn't become "1001.0"
+        if not pa.types.is_string(col.type) and not pa.types.is_floating(col.type):
+            table = table.set_column(table.schema.get_field_index(c), c, col.cast(pa.string()))
+    return normalize_upload(table.to_pandas()), []
+
+def _read_excel(uploaded):
+    header = pd.read_excel(uploaded, nrows=0)
+    rename_map, missing = _column_map(header.columns)
+    if missing:
+        return None, missing
+    uploaded.seek(0)
+    df = pd.read_excel(uploaded, dtype=_text_dtypes(rename_map))
+    return normalize_upload(df), []
+
+def read_upload(uploaded):
+    """Read an uploaded xlsx/csv/parquet file.
+
+    Returns (df_norm, missing_columns). df_norm is None when columns are missing.
+    """
+    head = uploaded.read(8)
+    uploaded.seek(0)
+    fmt = detect_format(getattr(uploaded, "name", ""), head)
+    if fmt == "csv":
+        return _read_csv(uploaded)
+    if fmt == "parquet":
+        return _read_parquet(uploaded)
+    if fmt == "xlsx":
+        return _read_excel(uploaded)
+    raise ValueError(f"Format file tidak didukung. Gunakan: {', '.join(SUPPORTED_TYPES)}")
+
+def build_records(df_norm, created_at):
+    # Convert normalized frame to supabase insert payload.
+    # Built from plain Python lists so nulls are always None (never NaN,
+    # which is invalid JSON), whatever dtype pandas inferred.
+    cols = {
+        "no_po": _py_values(df_norm["no_po"]),
+        "customer": _py_values(df_norm["customer"]),
+        "total_tagihan": _py_values(df_norm["total_tagihan"], float),
+        "total_bayar": _py_values(df_norm["total_bayar"], float),
+        "sisa": _py_values(df_norm["sisa"], float),
+        "status": _py_values(df_norm["status"]),
+        # str() like the per-row import did
+        "tanggal": _py_values(df_norm["tanggal"], str),
+        "jatuh_tempo": _py_values(df_norm["jatuh_tempo"], str),
+    }
+    return [dict(zip(cols, values), created_at=created_at) for values in zip(*cols.values())]
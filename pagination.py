@@ -0,0 +1,86 @@
+# pagination.py
+# Keyset (seek) pagination helpers for po_sales.
+# Rows are ordered by (sort_col, created_at, id), all in the same direction,
+# with Postgres' default null placement (first for desc, last for asc), so a
+# page is "everything after the last row of the previous page".
+from datetime import date
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Columns the table can be sorted on (label -> column)
+SORT_COLUMNS = {
+    "Dibuat": "created_at",
+    "Tanggal": "tanggal",
+    "Jatuh Tempo": "jatuh_tempo",
+    "No PO": "no_po",
+    "Customer": "customer",
+    "Total Tagihan": "total_tagihan",
+    "Sisa": "sisa",
+}
+
+def _quote(v):
+    # PostgREST value quoting (handles commas, dots, + in timestamps)
+    s = str(v).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{s}"'
+
+def order_columns(sort_col):
+    cols = [sort_col, "created_at", "id"]
+    return list(dict.fromkeys(cols))
+
+def cursor_from_row(row, sort_col):
+    # cursor = values of the ordering columns for the last row on a page
+    return {c: row.get(c) for c in order_columns(sort_col)}
+
+def keyset_condition(sort_col, desc, cursor):
+    """Build a PostgREST logic expression selecting rows after `cursor`.
+
+    Returns None for the first page.
+    """
+    if not cursor:
+        return None
+    op = "lt" if desc else "gt"
+    cols = order_columns(sort_col)
+
+    def after(i):
+        # rows after cursor considering cols[i:], given equality on cols[:i]
+        c = cols[i]
+        v = cursor.get(c)
+        rest = after(i + 1) if i + 1 < len(cols) else None
+        nullable = i == 0 and c not in ("created_at", "id")
+        if v is None:
+            # only sort_col may be null: finish the null block, then
+            # (desc, nulls first) continue with the non-null rows
+            parts = [f"and({c}.is.null,{rest})"] if rest else []
+            if desc:
+                parts.append(f"{c}.not.is.null")
+            if not parts:
+                return None
+            return parts[0] if len(parts) == 1 else f"or({','.join(parts)})"
+        parts = [f"{c}.{op}.{_quote(v)}"]
+        if nullable and not desc:
+            parts.append(f"{c}.is.null")
+        if rest:
+            parts.append(f"and({c}.eq.{_quote(v)},{rest})")
+        return parts[0] if len(parts) == 1 else f"or({','.join(parts)})"
+
+    return after(0)
+
+def month_condition(month, start_date, end_date):
+    # "bulan" filter as date ranges per year, so it can run server-side
+    if not month or not start_date or not end_date:
+        return None
+    ranges = []
+    for year in range(start_date.year, end_date.year + 1):
+        lo = date(year, month, 1)
+        hi = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        ranges.append(f"and(tanggal.gte.{lo.isoformat()},tanggal.lt.{hi.isoformat()})")
+    return f"or({','.join(ranges)})"
+
+def combine_conditions(*conds):
+    # Wrap conditions into a single value usable with .or_()
+    conds = [c for c in conds if c]
+    if not conds:
+        return None
+    if len(conds) == 1:
+        return conds[0][len("or("):-1] if conds[0].startswith("or(") else conds[0]
+    return f"and({','.join(conds)})"
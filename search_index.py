@@ -0,0 +1,212 @@
+# search_index.py
+# In-memory search over no_po and customer.
+# - prefix: sorted list of distinct normalized values + bisect
+# - substring / fuzzy: trigram -> ascending value ids containing it
+# Indexing distinct values (not rows) keeps customer postings small, since
+# many POs share one customer. Value ids are append-only, so postings stay
+# sorted and rows can be added / changed / removed without a rebuild.
+import heapq
+import threading
+from bisect import bisect_left, insort
+
+NGRAM = 3
+# fuzzy matching ignores trigrams present in more than this share of values
+STOP_GRAM_RATIO = 0.1
+FUZZY_MIN_STOP = 1000
+# rebuild from scratch once this share of value ids no longer has any row
+COMPACT_RATIO = 0.25
+
+def _norm(v):
+    if v is None or v != v:  # None / NaN
+        return ""
+    return " ".join(str(v).lower().split())
+
+def _ngrams(s):
+    return {s[i:i + NGRAM] for i in range(len(s) - NGRAM + 1)}
+
+def _contains(posting, vid):
+    i = bisect_left(posting, vid)
+    return i < len(posting) and posting[i] == vid
+
+class SearchIndex:
+    def __init__(self):
+        self.version = None
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.rows = {}            # row id -> (no_po, customer)
+        self.values = []          # value id -> normalized value
+        self.vid_by_value = {}    # normalized value -> value id
+        self.ids_by_vid = []      # value id -> row ids (empty = dead)
+        self.sorted_values = []   # live values, sorted, for prefix lookups
+        self.grams = {}           # trigram -> ascending value ids
+        self.dead = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    # ---- maintenance ----
+    def _link(self, key, rid, bulk=False):
+        vid = self.vid_by_value.get(key)
+        if vid is None:
+            vid = len(self.values)
+            self.values.append(key)
+            self.vid_by_value[key] = vid
+            self.ids_by_vid.append([])
+            for g in _ngrams(key):
+                self.grams.setdefault(g, []).append(vid)
+            if not bulk:
+                insort(self.sorted_values, key)
+        elif not self.ids_by_vid[vid]:
+            # value comes back to life
+            self.dead -= 1
+            insort(self.sorted_values, key)
+        self.ids_by_vid[vid].append(rid)
+
+    def _unlink(self, key, rid):
+        vid = self.vid_by_value[key]
+        ids = self.ids_by_vid[vid]
+        ids.remove(rid)
+        if not ids:
+            self.dead += 1
+            del self.sorted_values[bisect_left(self.sorted_values, key)]
+
+    def _keys(self, row):
+        return {k for k in (_norm(row[0]), _norm(row[1])) if k}
+
+    def _set_row(self, rid, row, bulk=False):
+        old = self.rows.get(rid)
+        if old == row:
+            return
+        old_keys = self._keys(old) if old else set()
+        new_keys = self._keys(row)
+        for key in old_keys - new_keys:
+            self._unlink(key, rid)
+        for key in new_keys - old_keys:
+            self._link(key, rid, bulk)
+        self.rows[rid] = row
+
+    def _remove_row(self, rid):
+        for key in self._keys(self.rows.pop(rid)):
+            self._unlink(key, rid)
+
+    def _build(self, new_rows):
+        self._reset()
+        for rid, row in new_rows.items():
+            self._set_row(rid, row, bulk=True)
+        self.sorted_values = sorted(self.vid_by_value)
+
+    def sync(self, ids, no_pos, customers, version):
+        """Bring the index in line with the current rows.
+
+        Only changed rows are touched; a full build happens on first use or
+        when too many dead values pile up.
+        """
+        with self.lock:
+            if version == self.version:
+                return
+            new_rows = dict(zip(ids, zip(no_pos, customers)))
+            if not self.rows or self.dead > COMPACT_RATIO * max(1, len(self.values)):
+                self._build(new_rows)
+            else:
+                for rid in [r for r in self.rows if r not in new_rows]:
+                    self._remove_row(rid)
+                for rid, row in new_rows.items():
+                    self._set_row(rid, row)
+            self.version = version
+
+    # ---- queries ----
+    def _row_count(self, vids):
+        return sum(len(self.ids_by_vid[vid]) for vid in vids)
+
+    def _prefix(self, q, limit):
+        out = []
+        i = bisect_left(self.sorted_values, q)
+        while i < len(self.sorted_values) and self.sorted_values[i].startswith(q) and len(out) < limit:
+            out.append(self.vid_by_value[self.sorted_values[i]])
+            i += 1
+        return out
+
+    def _substring(self, q, limit, seen):
+        postings = [self.grams.get(g) for g in _ngrams(q)]
+        if not postings or any(p is None for p in postings):
+            return []
+        # scan the rarest trigram's values only, verify, stop early
+        out = []
+        for vid in min(postings, key=len):
+            if vid not in seen and self.ids_by_vid[vid] and q in self.values[vid]:
+                out.append(vid)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def _fuzzy(self, q, limit, seen):
+        # trigrams found in most values (e.g. "po/") don't discriminate; drop them
+        max_posting = max(FUZZY_MIN_STOP, STOP_GRAM_RATIO * len(self.sorted_values))
+        postings = sorted((p for p in (self.grams.get(g) for g in _ngrams(q)) if p and len(p) <= max_posting), key=len)
+        # keep values sharing at least half of the remaining query trigrams
+        min_score = max(1, len(postings) // 2)
+        if not postings:
+            return []
+        # bounded merge: a value reaching min_score must be in one of the
+        # (n - min_score + 1) rarest postings; the common ones are only probed
+        n_gen = len(postings) - min_score + 1
+        scores = {}
+        for p in postings[:n_gen]:
+            for vid in p:
+                scores[vid] = scores.get(vid, 0) + 1
+        ranked = []
+        for vid, score in scores.items():
+            if vid in seen or not self.ids_by_vid[vid]:
+                continue
+            for p in postings[n_gen:]:
+                if _contains(p, vid):
+                    score += 1
+            if score >= min_score:
+                ranked.append((-score, abs(len(self.values[vid]) - len(q)), self.values[vid], vid))
+        return [x[-1] for x in heapq.nsmallest(limit, ranked)]
+
+    def search(self, query, limit=50):
+        """Return matching rows as a list of dicts (id, no_po, customer).
+
+        Prefix matches come first, then substring matches, then fuzzy ones.
+        """
+        q = _norm(query)
+        if not q:
+            return []
+        with self.lock:
+            vids = self._prefix(q, limit)
+            seen = set(vids)
+            if self._row_count(vids) < limit and len(q) >= NGRAM:
+                more = self._substring(q, limit - len(vids), seen)
+                vids += more
+                seen.update(more)
+                if self._row_count(vids) < limit:
+                    vids += self._fuzzy(q, limit - len(vids), seen)
+
+            rows = []
+            row_seen = set()
+            for vid in vids:
+                for rid in self.ids_by_vid[vid]:
+                    if rid in row_seen:
+                        continue
+                    row_seen.add(rid)
+                    no_po, customer = self.rows[rid]
+                    rows.append({"id": rid, "no_po": no_po, "customer": customer})
+                    if len(rows) >= limit:
+                        return rows
+            return rows
+
+def sync_search_index(index, df, version):
+    # df from fetch_all() (hot rows only); missing columns give an empty index
+    if df.empty or "id" not in df.columns:
+        index.sync([], [], [], version)
+        return index
+    index.sync(
+        df["id"].tolist(),
+        df["no_po"].tolist() if "no_po" in df.columns else [None] * len(df),
+        df["customer"].tolist() if "customer" in df.columns else [None] * len(df),
+        version,
+    )
+    return index
@@ -5,3 +5,16 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def select_all(make_query, page_size=1000):
+    # PostgREST caps each response (default 1000 rows), so read in ranges.
+    # make_query() must return a fresh, ordered query builder for every page.
+    rows = []
+    start = 0
+    while True:
+        res = make_query().range(start, start + page_size - 1).execute()
+        data = res.data or []
+        rows.extend(data)
+        if len(data) < page_size:
+            return rows
+        start += page_size